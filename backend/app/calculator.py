@@ -1,7 +1,16 @@
 import math
+import sys
 from typing import Tuple, Optional
 
 
+# log10 of the largest finite float and of the smallest positive (subnormal) float
+MAX_LOG10 = math.log10(sys.float_info.max)
+MIN_LOG10 = math.log10(sys.float_info.min * sys.float_info.epsilon)
+# Power estimates within this many decades of a limit are evaluated normally,
+# since results just past the smallest subnormal can still round up to it
+LOG10_MARGIN = 1.0
+
+
 class Calculator:
     """Calculator service for performing operations"""
 
@@ -35,9 +44,49 @@ class Calculator:
         return num1 % num2
 
     @staticmethod
-    def power(num1: float, num2: float) -> float:
-        """Calculate num1 to the power of num2"""
-        return num1 ** num2
+    def estimate_power_log10(num1: float, num2: float) -> float:
+        """
+        Predict log10 of the magnitude of num1 ** num2 without evaluating it
+
+        Args:
+            num1: Base (non-zero)
+            num2: Exponent
+
+        Returns:
+            num2 * log10(|num1|), which may be infinite
+        """
+        return num2 * math.log10(abs(num1))
+
+    @classmethod
+    def power(cls, num1: float, num2: float) -> float:
+        """
+        Calculate num1 to the power of num2
+
+        The result size is estimated from the operands first, so results
+        beyond float range are rejected and results below it short-circuit
+        to zero without evaluating the power.
+        """
+        if num1 == 0 and num2 < 0:
+            raise ValueError("Zero cannot be raised to a negative power")
+        if num1 < 0 and not float(num2).is_integer():
+            raise ValueError("Negative base requires an integer exponent")
+        if num1 == 0 or num2 == 0 or abs(num1) == 1:
+            return num1 ** num2
+
+        magnitude = cls.estimate_power_log10(num1, num2)
+        if magnitude > MAX_LOG10 + LOG10_MARGIN:
+            if math.isinf(magnitude):
+                raise ValueError("Result is too large to represent")
+            raise ValueError(f"Result is too large to represent (about 10^{magnitude:.3g})")
+        if magnitude < MIN_LOG10 - LOG10_MARGIN:
+            negative = num1 < 0 and num2 % 2 == 1
+            return -0.0 if negative else 0.0
+
+        try:
+            return float(num1) ** float(num2)
+        except OverflowError:
+            # Estimate was within rounding of the float limit
+            raise ValueError("Result is too large to represent")
 
     @staticmethod
     def sqrt(num1: float) -> float:
@@ -74,5 +123,13 @@ class Calculator:
 
         if operation not in operations:
             raise ValueError(f"Invalid operation: {operation}")
+        if not math.isfinite(num1) or (num2 is not None and not math.isfinite(num2)):
+            raise ValueError("Operands must be finite numbers")
 
-        return operations[operation]()
+        result = operations[operation]()
+        # JSON cannot carry inf/nan, so reject them here rather than at serialization
+        if math.isnan(result):
+            raise ValueError("Result is undefined")
+        if math.isinf(result):
+            raise ValueError("Result is too large to represent")
+        return result
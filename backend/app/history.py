@@ -1,5 +1,5 @@
 from collections import deque
-from typing import Deque, Optional
+from typing import Deque, Iterable, Iterator, Optional
 from datetime import datetime
 from app.models import CalculationResponse
 
@@ -54,6 +54,64 @@ class HistoryManager:
         """
         return list(self._history)
 
+    def iter_chunks(self, chunk_size: int) -> Iterator[list[CalculationResponse]]:
+        """
+        Iterate over a snapshot of history in chunks (most recent first)
+
+        Args:
+            chunk_size: Maximum number of entries per chunk
+
+        Yields:
+            Lists of calculation responses
+        """
+        snapshot = list(self._history)
+        for start in range(0, len(snapshot), chunk_size):
+            yield snapshot[start:start + chunk_size]
+
+    @staticmethod
+    def _entry_key(calculation: CalculationResponse) -> tuple:
+        """Identity of a history entry for de-duplicating imports"""
+        return (
+            calculation.timestamp,
+            calculation.operation,
+            calculation.num1,
+            calculation.num2,
+            calculation.result,
+        )
+
+    def import_calculations(self, calculations: Iterable[CalculationResponse]) -> int:
+        """
+        Merge calculations into history by timestamp
+
+        Existing and imported entries are interleaved most recent first and
+        only the newest max_size are kept, so restoring an older archive
+        never pushes live entries out of order. Entries already in history
+        are skipped, so importing the same archive twice is a no-op.
+
+        Args:
+            calculations: Calculations with naive UTC ISO timestamps
+
+        Returns:
+            Number of imported calculations kept in history
+        """
+        seen = {self._entry_key(c) for c in self._history}
+        imported = []
+        for calculation in calculations:
+            key = self._entry_key(calculation)
+            if key not in seen:
+                seen.add(key)
+                imported.append(calculation)
+        imported_ids = {id(c) for c in imported}
+        # Stable sort keeps existing entries ahead of imported ones on ties
+        merged = sorted(
+            [*self._history, *imported],
+            key=lambda c: datetime.fromisoformat(c.timestamp),
+            reverse=True
+        )[:self.max_size]
+        self._history.clear()
+        self._history.extend(merged)
+        return sum(id(c) in imported_ids for c in merged)
+
     def clear_history(self) -> None:
         """Clear all calculation history"""
         self._history.clear()
@@ -63,5 +121,25 @@ class HistoryManager:
         return len(self._history)
 
 
-# Global history manager instance
-history_manager = HistoryManager()
+# Global history manager instance, created on first use
+_history_manager: Optional[HistoryManager] = None
+
+
+def get_history_manager() -> HistoryManager:
+    """
+    Get the global history manager, creating it on first use
+
+    Returns:
+        The shared history manager
+    """
+    global _history_manager
+    if _history_manager is None:
+        _history_manager = HistoryManager()
+    return _history_manager
+
+
+def __getattr__(name: str):
+    """Resolve the legacy ``history_manager`` attribute lazily"""
+    if name == "history_manager":
+        return get_history_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
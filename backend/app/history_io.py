@@ -0,0 +1,231 @@
+"""
+History export and import formats
+
+Three formats are supported:
+    ndjson    One CalculationResponse JSON object per line
+    csv       Header row, then operation,num1,num2,result,timestamp
+    columnar  Compact binary record batches (see below)
+
+Columnar layout (all values little-endian):
+    magic       b"VCHC" followed by a uint8 format version
+    batches     repeated until end of stream, each:
+        uint32      row count n
+        uint8[n]    operation codes (index into OPERATIONS)
+        uint8[n]    1 if num2 is present, else 0
+        float64[n]  num1
+        float64[n]  num2 (0.0 where absent)
+        float64[n]  result
+        int64[n]    timestamp, microseconds since the Unix epoch (UTC)
+"""
+import csv
+import io
+import math
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+
+from app.models import CalculationResponse
+
+
+OPERATIONS = ("add", "subtract", "multiply", "divide", "modulo", "power", "sqrt")
+OPERATION_CODES = {name: code for code, name in enumerate(OPERATIONS)}
+
+COLUMNAR_MAGIC = b"VCHC"
+COLUMNAR_VERSION = 1
+CSV_FIELDS = ("operation", "num1", "num2", "result", "timestamp")
+
+_EPOCH = datetime(1970, 1, 1)
+_BATCH_HEADER = struct.Struct("<I")
+
+
+def _parse_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO timestamp as naive UTC, converting timezone-aware values"""
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is not None:
+        try:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        except OverflowError:
+            raise ValueError(f"Timestamp out of range: {timestamp}")
+    return parsed
+
+
+def _to_micros(timestamp: str) -> int:
+    """Convert an ISO timestamp to microseconds since the epoch (UTC)"""
+    delta = _parse_timestamp(timestamp) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(micros: int) -> str:
+    """Convert microseconds since the epoch to an ISO timestamp (naive UTC)"""
+    try:
+        return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+    except OverflowError:
+        raise ValueError(f"Timestamp out of range: {micros}")
+
+
+def _check_finite(num1: float, num2: Optional[float], result: float) -> None:
+    """Reject inf/nan values, which history cannot serialize back to JSON"""
+    for name, value in (("num1", num1), ("num2", num2), ("result", result)):
+        if value is not None and not math.isfinite(value):
+            raise ValueError(f"{name} must be a finite number")
+
+
+def _validate(calculation: CalculationResponse) -> CalculationResponse:
+    """Reject invalid calculations and normalize the timestamp to naive UTC"""
+    if calculation.operation not in OPERATION_CODES:
+        raise ValueError(f"Invalid operation: {calculation.operation}")
+    _check_finite(calculation.num1, calculation.num2, calculation.result)
+    calculation.timestamp = _parse_timestamp(calculation.timestamp).isoformat()
+    return calculation
+
+
+def _little_endian(values: array) -> bytes:
+    """Serialize an array in little-endian byte order"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(typecode: str, data: memoryview, offset: int, count: int) -> tuple[array, int]:
+    """Read count little-endian values of typecode from data at offset"""
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    if end > len(data):
+        raise ValueError("Truncated columnar data")
+    values.frombytes(data[offset:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, end
+
+
+def encode_ndjson(chunks: Iterable[list[CalculationResponse]]) -> Iterator[bytes]:
+    """Encode chunks of calculations as newline-delimited JSON"""
+    for chunk in chunks:
+        yield "".join(c.model_dump_json() + "\n" for c in chunk).encode("utf-8")
+
+
+def encode_csv(chunks: Iterable[list[CalculationResponse]]) -> Iterator[bytes]:
+    """Encode chunks of calculations as CSV with a header row"""
+    yield (",".join(CSV_FIELDS) + "\r\n").encode("utf-8")
+    for chunk in chunks:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for c in chunk:
+            writer.writerow([
+                c.operation,
+                repr(c.num1),
+                "" if c.num2 is None else repr(c.num2),
+                repr(c.result),
+                c.timestamp,
+            ])
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_columnar(chunks: Iterable[list[CalculationResponse]]) -> Iterator[bytes]:
+    """Encode chunks of calculations as columnar record batches"""
+    yield COLUMNAR_MAGIC + bytes([COLUMNAR_VERSION])
+    for chunk in chunks:
+        if not chunk:
+            continue
+        codes = bytes(OPERATION_CODES[c.operation] for c in chunk)
+        has_num2 = bytes(c.num2 is not None for c in chunk)
+        num1 = array("d", (c.num1 for c in chunk))
+        num2 = array("d", (0.0 if c.num2 is None else c.num2 for c in chunk))
+        result = array("d", (c.result for c in chunk))
+        timestamps = array("q", (_to_micros(c.timestamp) for c in chunk))
+        yield b"".join((
+            _BATCH_HEADER.pack(len(chunk)),
+            codes,
+            has_num2,
+            _little_endian(num1),
+            _little_endian(num2),
+            _little_endian(result),
+            _little_endian(timestamps),
+        ))
+
+
+def decode_ndjson(data: bytes) -> list[CalculationResponse]:
+    """Decode newline-delimited JSON into calculations"""
+    calculations = []
+    for line_number, line in enumerate(data.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            calculations.append(_validate(CalculationResponse.model_validate_json(line)))
+        except (ValidationError, ValueError) as e:
+            raise ValueError(f"Invalid record on line {line_number}: {e}")
+    return calculations
+
+
+def decode_csv(data: bytes) -> list[CalculationResponse]:
+    """Decode CSV with a header row into calculations"""
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8")))
+    if reader.fieldnames is None or set(CSV_FIELDS) - set(reader.fieldnames):
+        raise ValueError(f"CSV header must contain: {', '.join(CSV_FIELDS)}")
+    calculations = []
+    try:
+        for row in reader:
+            try:
+                calculations.append(_validate(CalculationResponse(
+                    operation=row["operation"],
+                    num1=row["num1"],
+                    num2=row["num2"] or None,
+                    result=row["result"],
+                    timestamp=row["timestamp"],
+                )))
+            except (ValidationError, ValueError) as e:
+                raise ValueError(f"Invalid record on line {reader.line_num}: {e}")
+    except csv.Error as e:
+        raise ValueError(f"Invalid record on line {reader.line_num}: {e}")
+    return calculations
+
+
+def decode_columnar(data: bytes) -> list[CalculationResponse]:
+    """Decode columnar record batches into calculations"""
+    header_size = len(COLUMNAR_MAGIC) + 1
+    if data[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC or len(data) < header_size:
+        raise ValueError("Not a columnar history export")
+    if data[len(COLUMNAR_MAGIC)] != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar version: {data[len(COLUMNAR_MAGIC)]}")
+
+    view = memoryview(data)
+    offset = header_size
+    calculations = []
+    while offset < len(view):
+        if offset + _BATCH_HEADER.size > len(view):
+            raise ValueError("Truncated columnar data")
+        (count,) = _BATCH_HEADER.unpack_from(view, offset)
+        offset += _BATCH_HEADER.size
+        codes, offset = _read_array("B", view, offset, count)
+        has_num2, offset = _read_array("B", view, offset, count)
+        num1, offset = _read_array("d", view, offset, count)
+        num2, offset = _read_array("d", view, offset, count)
+        result, offset = _read_array("d", view, offset, count)
+        timestamps, offset = _read_array("q", view, offset, count)
+        for i in range(count):
+            if codes[i] >= len(OPERATIONS):
+                raise ValueError(f"Invalid operation code: {codes[i]}")
+            operand2 = num2[i] if has_num2[i] else None
+            _check_finite(num1[i], operand2, result[i])
+            # Fields are already typed and checked, so skip model validation
+            calculations.append(CalculationResponse.model_construct(
+                operation=OPERATIONS[codes[i]],
+                num1=num1[i],
+                num2=operand2,
+                result=result[i],
+                timestamp=_from_micros(timestamps[i]),
+            ))
+    return calculations
+
+
+# Format name -> (media type, encoder, decoder)
+FORMATS: dict[str, tuple[str, Callable, Callable]] = {
+    "ndjson": ("application/x-ndjson", encode_ndjson, decode_ndjson),
+    "csv": ("text/csv; charset=utf-8", encode_csv, decode_csv),
+    "columnar": ("application/octet-stream", encode_columnar, decode_columnar),
+}
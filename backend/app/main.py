@@ -1,8 +1,15 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 from datetime import datetime
+import asyncio
+import logging
+import os
+import secrets
+import threading
 
 from app.models import (
     CalculationRequest,
@@ -10,21 +17,48 @@ from app.models import (
     ErrorResponse,
     HistoryResponse,
     HealthResponse,
-    ClearHistoryResponse
+    ClearHistoryResponse,
+    ImportHistoryResponse
 )
 from app.calculator import Calculator
-from app.history import history_manager
+from app.history import get_history_manager
+from app.profiling import (
+    MAX_PROFILE_SECONDS,
+    ServerTimingMiddleware,
+    profiler,
+    timing_mark,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Precompress the frontend in the background once the worker has started"""
+    warmup = asyncio.create_task(_warm_static_assets())
+    yield
+    await warmup
+
 
 app = FastAPI(
     title="Calculator API",
     description="A modern calculator API with history tracking",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Custom exception handler for validation errors
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with custom format"""
+    timing_mark("validate")
+    response = _validation_error_response(exc)
+    timing_mark("validation_handler")
+    return response
+
+
+def _validation_error_response(exc: RequestValidationError) -> JSONResponse:
+    """Build the error response for a request validation failure"""
     # Check if this is an invalid operation value
     errors = exc.errors()
     for error in errors:
@@ -71,6 +105,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage Server-Timing, off unless enabled by config or debug header
+app.add_middleware(ServerTimingMiddleware)
+
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -92,23 +129,26 @@ async def calculate(request: CalculationRequest):
     Raises:
         HTTPException: If calculation fails
     """
+    timing_mark("validate")
     try:
         result = Calculator.calculate(
             operation=request.operation,
             num1=request.num1,
             num2=request.num2
         )
+        timing_mark("calculate")
 
         timestamp = datetime.utcnow().isoformat()
 
         # Add to history
-        history_manager.add_calculation(
+        get_history_manager().add_calculation(
             operation=request.operation,
             num1=request.num1,
             num2=request.num2,
             result=result,
             timestamp=timestamp
         )
+        timing_mark("history")
 
         return CalculationResponse(
             operation=request.operation,
@@ -143,7 +183,7 @@ async def get_history():
     Returns:
         History response with list of calculations
     """
-    history = history_manager.get_history()
+    history = get_history_manager().get_history()
     return HistoryResponse(history=history)
 
 
@@ -155,10 +195,206 @@ async def clear_history():
     Returns:
         Success message
     """
-    history_manager.clear_history()
+    get_history_manager().clear_history()
     return ClearHistoryResponse(message="History cleared successfully")
 
 
+@app.get("/history/export", responses={400: {"model": ErrorResponse}})
+async def export_history(format: str = "ndjson", chunk_size: int = 1000):
+    """
+    Stream calculation history (most recent first)
+
+    Args:
+        format: One of ndjson, csv or columnar
+        chunk_size: Number of entries encoded per streamed chunk
+
+    Returns:
+        Streaming response in the requested format
+    """
+    from app.history_io import FORMATS
+
+    if format not in FORMATS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unsupported format: {format}"}
+        )
+    if chunk_size < 1:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "chunk_size must be positive"}
+        )
+    media_type, encode, _ = FORMATS[format]
+    chunks = get_history_manager().iter_chunks(chunk_size)
+    return StreamingResponse(encode(chunks), media_type=media_type)
+
+
+# Far more than a full history export in any format
+MAX_IMPORT_BYTES = 1024 * 1024
+
+
+async def _read_limited_body(request: Request, limit: int) -> bytes | None:
+    """Read the request body, or return None once it exceeds limit bytes"""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > limit:
+        return None
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > limit:
+            return None
+    return bytes(body)
+
+
+@app.post(
+    "/history/import",
+    response_model=ImportHistoryResponse,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}}
+)
+async def import_history(request: Request, format: str = "ndjson", replace: bool = False):
+    """
+    Bulk-import calculation history from an export
+
+    Args:
+        format: One of ndjson, csv or columnar
+        replace: Clear existing history before importing
+
+    Returns:
+        Entries received, entries kept after merging by timestamp,
+        and the resulting history size
+    """
+    from app.history_io import FORMATS
+
+    if format not in FORMATS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unsupported format: {format}"}
+        )
+    body = await _read_limited_body(request, MAX_IMPORT_BYTES)
+    if body is None:
+        return JSONResponse(
+            status_code=413,
+            content={"error": f"Import body exceeds {MAX_IMPORT_BYTES} bytes"}
+        )
+    _, _, decode = FORMATS[format]
+    try:
+        calculations = decode(body)
+    except (ValueError, UnicodeDecodeError) as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(e)}
+        )
+
+    history_manager = get_history_manager()
+    if replace:
+        history_manager.clear_history()
+    imported = history_manager.import_calculations(calculations)
+    return ImportHistoryResponse(
+        received=len(calculations),
+        imported=imported,
+        count=history_manager.get_count()
+    )
+
+
+@app.get("/admin/profile", include_in_schema=False)
+async def profile(
+    seconds: float = 5.0,
+    idle: bool = False,
+    x_admin_token: str | None = Header(default=None)
+):
+    """
+    Sample live traffic for a number of seconds
+
+    Enabled only when the ADMIN_TOKEN environment variable is set; the
+    same value must be sent in the X-Admin-Token header.
+
+    Args:
+        seconds: How long to sample for (at most 60)
+        idle: Include threads waiting for work or I/O
+
+    Returns:
+        Collapsed stacks suitable for flamegraph.pl or speedscope
+    """
+    admin_token = os.environ.get("ADMIN_TOKEN")
+    if not admin_token:
+        return JSONResponse(status_code=404, content={"error": "Not found"})
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, admin_token):
+        return JSONResponse(status_code=403, content={"error": "Forbidden"})
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"seconds must be between 0 and {MAX_PROFILE_SECONDS:g}"}
+        )
+    try:
+        stacks = await run_in_threadpool(profiler.profile, seconds, idle)
+    except RuntimeError as e:
+        return JSONResponse(status_code=409, content={"error": str(e)})
+    return PlainTextResponse(stacks)
+
+
+_static_assets_lock = threading.Lock()
+_static_assets_built = False
+_static_assets = None
+
+
+def get_static_assets():
+    """
+    Load and precompress the frontend, building it at most once
+
+    app.static is imported here rather than at module import, so the
+    compression work starts in the lifespan warmup (or on the first
+    frontend request) instead of delaying import. Concurrent callers
+    wait for the single build instead of starting their own.
+
+    Returns:
+        The frontend assets, or None if there is no frontend directory
+    """
+    global _static_assets, _static_assets_built
+    if _static_assets_built:
+        return _static_assets
+    with _static_assets_lock:
+        if not _static_assets_built:
+            from app.static import StaticAssets, get_frontend_dir
+
+            frontend_dir = get_frontend_dir()
+            _static_assets = StaticAssets(frontend_dir) if frontend_dir.is_dir() else None
+            _static_assets_built = True
+    return _static_assets
+
+
+async def load_static_assets():
+    """Get the frontend assets, building them in a worker thread if needed"""
+    if _static_assets_built:
+        return _static_assets
+    return await run_in_threadpool(get_static_assets)
+
+
+async def _warm_static_assets() -> None:
+    """Build the frontend assets at startup, logging failures as they happen"""
+    try:
+        await load_static_assets()
+    except Exception:
+        logger.exception("Failed to build frontend assets; retrying on first request")
+
+
+# Serve the frontend from the same origin when it is available
+@app.api_route("/", methods=["GET", "HEAD"], include_in_schema=False)
+async def frontend_index(request: Request):
+    """Serve the frontend entry page"""
+    static_assets = await load_static_assets()
+    if static_assets is None:
+        return JSONResponse(status_code=404, content={"error": "Not found"})
+    return static_assets.index_response(request)
+
+
+@app.api_route("/assets/{name}", methods=["GET", "HEAD"], include_in_schema=False)
+async def frontend_asset(request: Request, name: str):
+    """Serve a fingerprinted frontend asset"""
+    static_assets = await load_static_assets()
+    if static_assets is None:
+        return JSONResponse(status_code=404, content={"error": "Not found"})
+    return static_assets.asset_response(request, name)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -47,3 +47,10 @@ class HealthResponse(BaseModel):
 class ClearHistoryResponse(BaseModel):
     """Clear history response"""
     message: str
+
+
+class ImportHistoryResponse(BaseModel):
+    """Import history response"""
+    received: int
+    imported: int
+    count: int
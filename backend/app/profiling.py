@@ -0,0 +1,208 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+DEBUG_TIMING_HEADER = "X-Debug-Timing"
+_DEBUG_TIMING_HEADER_KEY = DEBUG_TIMING_HEADER.lower().encode("latin-1")
+_TRUTHY = ("1", "true", "yes")
+MAX_PROFILE_SECONDS = 60.0
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Innermost Python frames of threads parked waiting for work or I/O
+IDLE_FRAMES = frozenset({
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+})
+
+
+def _is_truthy(value: str) -> bool:
+    """Whether a config or header value turns a feature on"""
+    return value.strip().lower() in _TRUTHY
+
+
+def server_timing_enabled() -> bool:
+    """Whether Server-Timing is on for every request (SERVER_TIMING=1)"""
+    return _is_truthy(os.environ.get("SERVER_TIMING", ""))
+
+
+def debug_timing_requested(headers: list[tuple[bytes, bytes]]) -> bool:
+    """Whether raw ASGI request headers ask for Server-Timing via X-Debug-Timing"""
+    for name, value in headers:
+        if name == _DEBUG_TIMING_HEADER_KEY:
+            return _is_truthy(value.decode("latin-1"))
+    return False
+
+
+class ServerTiming:
+    """Collects per-stage durations for a single request"""
+
+    def __init__(self):
+        """Start timing at the current instant"""
+        self.start = time.perf_counter()
+        self._last = self.start
+        self.stages: list[tuple[str, float]] = []
+
+    def mark(self, name: str) -> None:
+        """
+        Record the time since the previous mark as a named stage
+
+        Args:
+            name: Stage name (a Server-Timing metric token)
+        """
+        now = time.perf_counter()
+        self.stages.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def header_value(self) -> str:
+        """Format recorded stages and the total as a Server-Timing header value"""
+        total = (time.perf_counter() - self.start) * 1000
+        metrics = [f"{name};dur={duration:.3f}" for name, duration in self.stages]
+        metrics.append(f"total;dur={total:.3f}")
+        return ", ".join(metrics)
+
+
+_current_timing: ContextVar[Optional[ServerTiming]] = ContextVar(
+    "current_timing", default=None
+)
+
+
+def start_timing() -> ServerTiming:
+    """Begin timing the current request"""
+    timing = ServerTiming()
+    _current_timing.set(timing)
+    return timing
+
+
+def timing_mark(name: str) -> None:
+    """Mark a stage boundary for the current request; no-op when timing is off"""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.mark(name)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware adding a per-stage Server-Timing header
+
+    Requests pass straight through unless SERVER_TIMING is on or the
+    request carries a truthy X-Debug-Timing header (1, true or yes).
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize middleware
+
+        Args:
+            app: The wrapped ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request when enabled, otherwise pass it through untouched"""
+        if scope["type"] != "http" or not (
+            server_timing_enabled() or debug_timing_requested(scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        timing = start_timing()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timing.mark("serialize")
+                MutableHeaders(scope=message).append("Server-Timing", timing.header_value())
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler producing collapsed stacks for flame graphs"""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """
+        Initialize profiler
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether a profile is currently being collected"""
+        return self._lock.locked()
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        """Label a frame as module-file:qualified-name"""
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        return f"{filename}:{code.co_qualname}".replace(";", ":")
+
+    @staticmethod
+    def _is_idle(frame) -> bool:
+        """Whether a thread's innermost frame is a known wait for work or I/O"""
+        code = frame.f_code
+        return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+    def _sample(self, counts: Counter, own_thread: int, include_idle: bool) -> None:
+        """Record the current stack of every other thread"""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            if not include_idle and self._is_idle(frame):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            stack.reverse()
+            counts[";".join(stack)] += 1
+
+    def profile(self, seconds: float, include_idle: bool = False) -> str:
+        """
+        Sample all threads for a period of time (blocks the calling thread)
+
+        Threads parked in IDLE_FRAMES (idle threadpool workers, the event
+        loop waiting in select) are skipped unless include_idle is set, so
+        the flame graph shows work rather than waiting.
+
+        Args:
+            seconds: How long to sample for
+            include_idle: Also record threads that are waiting
+
+        Returns:
+            Collapsed stacks, one "frame;frame;frame count" line per stack
+
+        Raises:
+            RuntimeError: If a profile is already running
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            counts: Counter = Counter()
+            own_thread = threading.get_ident()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                self._sample(counts, own_thread, include_idle)
+                time.sleep(self.interval)
+        finally:
+            self._lock.release()
+        return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+# Global profiler instance
+profiler = SamplingProfiler()
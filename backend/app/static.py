@@ -0,0 +1,205 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+DEFAULT_FRONTEND_DIR = Path(__file__).resolve().parents[2] / "frontend"
+ASSET_PREFIX = "/assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+INDEX_CACHE_CONTROL = "no-cache"
+
+# Smaller files gain nothing from compression once headers are counted
+MIN_COMPRESS_SIZE = 256
+
+
+@dataclass
+class StaticFile:
+    """A static file with its precompressed variants"""
+    media_type: str
+    etag: str
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+
+def parse_accept_encoding(header: Optional[str]) -> dict[str, float]:
+    """
+    Parse an Accept-Encoding header into a mapping of encoding to quality
+
+    Args:
+        header: Raw Accept-Encoding header value
+
+    Returns:
+        Mapping of lower-cased encoding names to their q-values
+    """
+    encodings: dict[str, float] = {}
+    if not header:
+        return encodings
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: Optional[str], available: list[str]) -> str:
+    """
+    Pick the best available content encoding for a request
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        available: Encodings we hold a variant for, in order of preference
+
+    Returns:
+        The chosen encoding, or "identity" if none is acceptable
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = "identity", 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compress(content: bytes) -> dict[str, bytes]:
+    """Build the encoded variants of content, keeping only those that are smaller"""
+    variants = {"identity": content}
+    if len(content) < MIN_COMPRESS_SIZE:
+        return variants
+    candidates = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        candidates["br"] = brotli.compress(content, quality=11)
+    for encoding, data in candidates.items():
+        if len(data) < len(content):
+            variants[encoding] = data
+    return variants
+
+
+def _media_type(name: str) -> str:
+    """Guess a media type for a file name, adding a charset for text types"""
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+class StaticAssets:
+    """Serves the frontend with fingerprinted, precompressed assets"""
+
+    def __init__(self, directory: Path, index_name: str = "index.html"):
+        """
+        Load and precompress every file in the frontend directory
+
+        Args:
+            directory: Directory containing the frontend files
+            index_name: Entry page served at the site root
+        """
+        self.directory = directory
+        self.index_name = index_name
+        self.assets: dict[str, StaticFile] = {}
+        self.index: Optional[StaticFile] = None
+        self._build()
+
+    def _build(self) -> None:
+        """Fingerprint assets and rewrite the index page to reference them"""
+        renames: dict[str, str] = {}
+        for path in sorted(self.directory.iterdir()):
+            if not path.is_file() or path.suffix not in (".css", ".js"):
+                continue
+            content = path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            hashed_name = f"{path.stem}.{digest}{path.suffix}"
+            renames[path.name] = hashed_name
+            self.assets[hashed_name] = StaticFile(
+                media_type=_media_type(path.name),
+                etag=digest,
+                variants=_compress(content),
+            )
+
+        index_path = self.directory / self.index_name
+        if not index_path.is_file():
+            return
+        html = index_path.read_text(encoding="utf-8")
+        for original, hashed_name in renames.items():
+            for quote in ('"', "'"):
+                html = html.replace(
+                    f"{quote}{original}{quote}",
+                    f"{quote}{ASSET_PREFIX}{hashed_name}{quote}"
+                )
+        # Same-origin API calls when the page is served by the backend
+        html = html.replace(
+            "<head>",
+            '<head>\n    <meta name="api-url" content="">',
+            1
+        )
+        content = html.encode("utf-8")
+        self.index = StaticFile(
+            media_type=_media_type(self.index_name),
+            etag=hashlib.sha256(content).hexdigest()[:16],
+            variants=_compress(content),
+        )
+
+    @staticmethod
+    def _respond(request: Request, static_file: StaticFile, cache_control: str) -> Response:
+        """Build a negotiated response for a static file, honouring If-None-Match"""
+        available = [e for e in ("br", "gzip") if e in static_file.variants]
+        encoding = choose_encoding(request.headers.get("accept-encoding"), available)
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        etag = f'"{static_file.etag}{suffix}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=static_file.variants[encoding],
+            media_type=static_file.media_type,
+            headers=headers
+        )
+
+    def index_response(self, request: Request) -> Response:
+        """Serve the index page, revalidated on every load"""
+        if self.index is None:
+            return Response(status_code=404)
+        return self._respond(request, self.index, INDEX_CACHE_CONTROL)
+
+    def asset_response(self, request: Request, name: str) -> Response:
+        """Serve a fingerprinted asset with a long-lived immutable cache"""
+        static_file = self.assets.get(name)
+        if static_file is None:
+            return Response(status_code=404)
+        return self._respond(request, static_file, IMMUTABLE_CACHE_CONTROL)
+
+
+def get_frontend_dir() -> Path:
+    """Frontend directory, overridable with the FRONTEND_DIR environment variable"""
+    return Path(os.environ.get("FRONTEND_DIR", DEFAULT_FRONTEND_DIR))
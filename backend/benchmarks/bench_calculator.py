@@ -0,0 +1,54 @@
+"""
+Micro-benchmarks for Calculator
+
+Measures the cost of the pre-evaluation analysis in Calculator.power against
+a bare ``**`` and the cheap paths it adds for out-of-range results.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_calculator
+"""
+import timeit
+
+from app.calculator import Calculator
+
+
+def _ns_per_call(stmt, number: int, repeat: int = 5) -> float:
+    """Best-of-repeat time per call in nanoseconds"""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e9
+
+
+def _rejected(num1: float, num2: float) -> None:
+    """Call power on inputs expected to be rejected"""
+    try:
+        Calculator.power(num1, num2)
+    except ValueError:
+        pass
+
+
+def main(number: int = 200_000) -> None:
+    """Run the benchmarks and print ns/call"""
+    # Operands are variables so the bare power is not constant-folded
+    base, exponent = 2.5, 10.5
+
+    def bare_power(num1: float, num2: float) -> float:
+        return num1 ** num2
+
+    cases = [
+        ("bare num1 ** num2", lambda: bare_power(base, exponent)),
+        ("Calculator.power (in range)", lambda: Calculator.power(base, exponent)),
+        ("Calculator.power (underflow -> 0)", lambda: Calculator.power(10.0, -400.0)),
+        ("Calculator.power (overflow -> 400)", lambda: _rejected(10.0, 400.0)),
+        ("Calculator.calculate('power')", lambda: Calculator.calculate("power", base, exponent)),
+        ("Calculator.calculate('add')", lambda: Calculator.calculate("add", base, exponent)),
+    ]
+    results = [(name, _ns_per_call(stmt, number)) for name, stmt in cases]
+    width = max(len(name) for name, _ in results)
+    for name, ns in results:
+        print(f"{name:<{width}}  {ns:8.1f} ns/call")
+    overhead = results[1][1] - results[0][1]
+    print(f"\nPower validation overhead: {overhead:.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Socket-level load generator for the calculator API
+
+Starts the app under uvicorn (or targets an existing server) and drives it
+from several client processes, each running many concurrent httpx clients.
+
+Usage:
+    python -m benchmarks.loadtest --workers 4 --processes 4 --concurrency 50 --duration 30
+    python -m benchmarks.loadtest --url http://localhost:8000 --mix calculate=90,history=9,clear=1
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+
+from app.calculator import Calculator
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+KINDS = ("calculate", "history", "clear")
+DEFAULT_MIX = "calculate=80,history=15,clear=5"
+BINARY_OPERATIONS = ("add", "subtract", "multiply", "divide", "modulo", "power")
+HISTORY_LIMIT = 25
+
+# Status recorded for requests that failed before any response arrived
+TRANSPORT_ERROR_STATUS = 0
+# Per-client backoff after a transport error, doubling up to the maximum
+ERROR_BACKOFF_INITIAL = 0.01
+ERROR_BACKOFF_MAX = 0.5
+
+
+@dataclass
+class ClientResult:
+    """Measurements collected by one client process"""
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    errors: Counter = field(default_factory=Counter)
+    inconsistencies: Counter = field(default_factory=Counter)
+    # Wall time from first request to the last in-flight request finishing
+    elapsed: float = 0.0
+
+    def merge(self, other: "ClientResult") -> None:
+        """Fold another process's measurements into this one"""
+        for kind, values in other.latencies.items():
+            self.latencies[kind].extend(values)
+        for kind, counts in other.statuses.items():
+            self.statuses[kind].update(counts)
+        self.errors.update(other.errors)
+        self.inconsistencies.update(other.inconsistencies)
+        # Client processes run concurrently, so the slowest one spans the run
+        self.elapsed = max(self.elapsed, other.elapsed)
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """
+    Parse a request mix such as "calculate=80,history=15,clear=5"
+
+    Returns:
+        Mapping of request kind to weight
+
+    Raises:
+        ValueError: If a kind is unknown or a weight is invalid
+    """
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in KINDS:
+            raise ValueError(f"Unknown request kind: {kind}")
+        try:
+            weights[kind] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {kind}: {weight}")
+        if weights[kind] < 0:
+            raise ValueError(f"Weight for {kind} must not be negative")
+    if not any(weights.values()):
+        raise ValueError("Mix must contain at least one positive weight")
+    return weights
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def random_calculation(rng: random.Random) -> dict:
+    """Build a random /calculate request body"""
+    if rng.random() < 0.1:
+        return {"operation": "sqrt", "num1": rng.uniform(0, 1000)}
+    operation = rng.choice(BINARY_OPERATIONS)
+    if operation == "power":
+        num1 = round(rng.uniform(0.5, 10), 3)
+        num2 = rng.randint(-5, 5)
+    else:
+        num1 = round(rng.uniform(-1000, 1000), 3)
+        num2 = round(rng.uniform(-100, 100), 3) or 1.0
+    return {"operation": operation, "num1": num1, "num2": num2}
+
+
+def _result_matches(entry: dict) -> bool:
+    """Whether a returned calculation agrees with a local recomputation"""
+    try:
+        expected = Calculator.calculate(entry["operation"], entry["num1"], entry.get("num2"))
+    except (ValueError, OverflowError, ZeroDivisionError):
+        return False
+    return math.isclose(entry["result"], expected, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def check_history(history: list[dict]) -> list[str]:
+    """
+    Check a /history response for consistency
+
+    Returns:
+        Names of the invariants that were violated
+    """
+    problems = []
+    if len(history) > HISTORY_LIMIT:
+        problems.append("history_too_long")
+    timestamps = [entry["timestamp"] for entry in history]
+    if timestamps != sorted(timestamps, reverse=True):
+        problems.append("history_out_of_order")
+    if not all(_result_matches(entry) for entry in history):
+        problems.append("history_wrong_result")
+    return problems
+
+
+async def _client_loop(
+    client: httpx.AsyncClient,
+    kinds: list[str],
+    weights: list[float],
+    deadline: float,
+    result: ClientResult,
+    rng: random.Random,
+) -> None:
+    """Issue requests from one simulated client until the deadline"""
+    backoff = ERROR_BACKOFF_INITIAL
+    while time.monotonic() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        start = time.perf_counter()
+        try:
+            if kind == "calculate":
+                response = await client.post("/calculate", json=random_calculation(rng))
+            elif kind == "history":
+                response = await client.get("/history")
+            else:
+                response = await client.delete("/history")
+        except httpx.HTTPError as e:
+            result.latencies[kind].append(time.perf_counter() - start)
+            result.statuses[kind][TRANSPORT_ERROR_STATUS] += 1
+            result.errors[type(e).__name__] += 1
+            # Back off so a dead server does not turn the clients into a busy loop
+            await asyncio.sleep(min(backoff, max(0.0, deadline - time.monotonic())))
+            backoff = min(backoff * 2, ERROR_BACKOFF_MAX)
+            continue
+        backoff = ERROR_BACKOFF_INITIAL
+        result.latencies[kind].append(time.perf_counter() - start)
+        result.statuses[kind][response.status_code] += 1
+
+        if response.status_code != 200:
+            continue
+        if kind == "calculate" and not _result_matches(response.json()):
+            result.inconsistencies["calculate_wrong_result"] += 1
+        elif kind == "history":
+            for problem in check_history(response.json()["history"]):
+                result.inconsistencies[problem] += 1
+
+
+async def run_clients(
+    concurrency: int,
+    duration: float,
+    mix: dict[str, float],
+    client_factory: Callable[[], httpx.AsyncClient],
+    seed: Optional[int] = None,
+) -> ClientResult:
+    """
+    Run concurrent clients in the current process
+
+    Args:
+        concurrency: Number of concurrent clients
+        duration: Seconds to generate load for
+        mix: Request kind weights
+        client_factory: Creates the shared httpx client
+        seed: Random seed for reproducible request streams
+
+    Returns:
+        Measurements for this process
+    """
+    result = ClientResult()
+    kinds, weights = list(mix), list(mix.values())
+    start = time.monotonic()
+    deadline = start + duration
+    rng = random.Random(seed)
+    async with client_factory() as client:
+        await asyncio.gather(*(
+            _client_loop(client, kinds, weights, deadline, result, random.Random(rng.random()))
+            for _ in range(concurrency)
+        ))
+    # Requests in flight at the deadline still complete, so measure real time
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+def _client_process(url: str, concurrency: int, duration: float, mix: dict[str, float], seed: int) -> ClientResult:
+    """Entry point for a client process"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    def factory() -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0)
+
+    return asyncio.run(run_clients(concurrency, duration, mix, factory, seed))
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused local port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, timeout: float = 30.0) -> subprocess.Popen:
+    """
+    Start the app under uvicorn and wait until /health responds
+
+    Raises:
+        RuntimeError: If the server does not become healthy in time
+    """
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Server did not become healthy in time")
+
+
+def summarize(result: ClientResult) -> dict:
+    """Build the report of throughput, latency percentiles and error rates"""
+    elapsed = result.elapsed
+    kinds = {}
+    total_requests = 0
+    for kind, latencies in result.latencies.items():
+        count = len(latencies)
+        total_requests += count
+        failed = sum(
+            n for status, n in result.statuses[kind].items()
+            if status >= 500 or status == TRANSPORT_ERROR_STATUS
+        )
+        kinds[kind] = {
+            "requests": count,
+            "throughput_rps": count / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p90_ms": percentile(latencies, 90) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": max(latencies, default=0.0) * 1000,
+            "error_rate": failed / count if count else 0.0,
+            "statuses": {str(status): n for status, n in sorted(result.statuses[kind].items())},
+        }
+    transport_errors = sum(result.errors.values())
+    return {
+        "elapsed_s": elapsed,
+        "requests": total_requests,
+        "throughput_rps": total_requests / elapsed if elapsed else 0.0,
+        "transport_errors": dict(result.errors),
+        "transport_error_rate": transport_errors / total_requests if total_requests else 0.0,
+        "inconsistencies": dict(result.inconsistencies),
+        "kinds": kinds,
+    }
+
+
+def format_report(report: dict) -> str:
+    """Render a report as a plain-text table"""
+    lines = [
+        f"Elapsed: {report['elapsed_s']:.1f}s  "
+        f"Requests: {report['requests']}  "
+        f"Throughput: {report['throughput_rps']:.1f} req/s",
+        "",
+        f"{'kind':<10} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>8} {'errors':>7}",
+    ]
+    for kind, stats in sorted(report["kinds"].items()):
+        lines.append(
+            f"{kind:<10} {stats['requests']:>9} {stats['throughput_rps']:>9.1f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p90_ms']:>8.2f} {stats['p99_ms']:>8.2f} "
+            f"{stats['max_ms']:>8.2f} {stats['error_rate']:>7.2%}"
+        )
+    lines.append("")
+    lines.append(
+        f"Transport errors: {report['transport_error_rate']:.2%} {report['transport_errors'] or ''}"
+    )
+    lines.append(f"History inconsistencies: {report['inconsistencies'] or 'none'}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--processes", type=int, default=2, help="client processes")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent clients per process")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"request mix (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        server = start_server(port, args.workers)
+        url = f"http://127.0.0.1:{port}"
+
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    try:
+        result = ClientResult()
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            futures = [
+                pool.submit(_client_process, url, args.concurrency, args.duration, mix, seed + i)
+                for i in range(args.processes)
+            ]
+            for future in futures:
+                result.merge(future.result())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = summarize(result)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -241,3 +241,124 @@ class TestAPIEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "timestamp" in data
+
+
+class TestPowerLimits:
+    """Test cost-bounded evaluation of power and out-of-range results"""
+
+    def test_power_overflow_returns_400(self):
+        """Test results beyond float range are rejected with a precise error"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": 10, "num2": 400}
+        )
+        assert response.status_code == 400
+        assert "too large" in response.json()["error"]
+        assert "10^400" in response.json()["error"]
+
+    def test_power_huge_exponent_returns_400(self):
+        """Test enormous exponents are rejected without evaluation"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": -1e-5, "num2": -1e300}
+        )
+        assert response.status_code == 400
+        assert response.json()["error"] == (
+            "Result is too large to represent (about 10^5e+300)"
+        )
+
+    def test_power_infinite_magnitude_message(self):
+        """Test an estimate that overflows itself gets a fixed message"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": 1e308, "num2": 1e308}
+        )
+        assert response.status_code == 400
+        assert response.json()["error"] == "Result is too large to represent"
+
+    def test_power_at_float_limit(self):
+        """Test results just within float range still succeed"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": 2, "num2": 1023}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == 2.0 ** 1023
+
+    def test_power_at_subnormal_limit(self):
+        """Test results that round up to the smallest subnormal are not zeroed"""
+        for num1, num2 in [(10, -323.5), (2, -1074.4)]:
+            response = client.post(
+                "/calculate",
+                json={"operation": "power", "num1": num1, "num2": num2}
+            )
+            assert response.status_code == 200
+            assert response.json()["result"] == 5e-324
+
+    def test_power_just_beyond_float_limit(self):
+        """Test results rounding past the float limit return 400"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": 2, "num2": 1024}
+        )
+        assert response.status_code == 400
+
+    def test_power_underflow_short_circuits_to_zero(self):
+        """Test results below float range return zero"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": 10, "num2": -400}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == 0
+
+    def test_power_zero_negative_exponent(self):
+        """Test zero to a negative power returns 400"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": 0, "num2": -1}
+        )
+        assert response.status_code == 400
+        assert "error" in response.json()
+
+    def test_power_negative_base_fractional_exponent(self):
+        """Test negative base with a fractional exponent returns 400"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": -8, "num2": 0.5}
+        )
+        assert response.status_code == 400
+        assert "integer exponent" in response.json()["error"]
+
+    def test_power_negative_base_integer_exponent(self):
+        """Test negative base with an integer exponent"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "power", "num1": -2, "num2": 3}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == -8
+
+    @pytest.mark.parametrize("body", [
+        '{"operation": "power", "num1": NaN, "num2": 2}',
+        '{"operation": "power", "num1": 2, "num2": NaN}',
+        '{"operation": "subtract", "num1": Infinity, "num2": Infinity}',
+    ])
+    def test_non_finite_operands_return_400(self, body):
+        """Test NaN and infinite operands are rejected as such"""
+        response = client.post(
+            "/calculate",
+            content=body,
+            headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 400
+        assert response.json()["error"] == "Operands must be finite numbers"
+
+    def test_multiplication_overflow_returns_400(self):
+        """Test non-finite results from other operations return 400"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "multiply", "num1": 1e308, "num2": 10}
+        )
+        assert response.status_code == 400
+        assert "too large" in response.json()["error"]
@@ -0,0 +1,216 @@
+import struct
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import MAX_IMPORT_BYTES, app
+from app.history_io import COLUMNAR_MAGIC, COLUMNAR_VERSION
+
+client = TestClient(app)
+
+
+def _assert_most_recent_first(history: list[dict]) -> None:
+    """Assert history timestamps never increase"""
+    timestamps = [entry["timestamp"] for entry in history]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+CALCULATIONS = [
+    {"operation": "add", "num1": 5, "num2": 3},
+    {"operation": "divide", "num1": 1, "num2": 3},
+    {"operation": "sqrt", "num1": 2},
+    {"operation": "power", "num1": 2, "num2": -0.5},
+]
+
+
+class TestHistoryExport:
+    """Test streaming history export and bulk import"""
+
+    def setup_method(self):
+        """Start each test with a known history"""
+        client.delete("/history")
+        for calculation in CALCULATIONS:
+            client.post("/calculate", json=calculation)
+
+    @pytest.mark.parametrize("format", ["ndjson", "csv", "columnar"])
+    def test_round_trip(self, format):
+        """Test export then import restores identical history"""
+        original = client.get("/history").json()["history"]
+        exported = client.get("/history/export", params={"format": format, "chunk_size": 3})
+        assert exported.status_code == 200
+
+        client.delete("/history")
+        response = client.post(
+            "/history/import",
+            params={"format": format},
+            content=exported.content
+        )
+        assert response.status_code == 200
+        assert response.json() == {"received": 4, "imported": 4, "count": 4}
+        assert client.get("/history").json()["history"] == original
+
+    def test_ndjson_export(self):
+        """Test NDJSON export has one record per line, most recent first"""
+        response = client.get("/history/export")
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert len(lines) == 4
+        assert '"operation":"power"' in lines[0]
+
+    def test_csv_export(self):
+        """Test CSV export has a header and empty num2 for single operand operations"""
+        response = client.get("/history/export", params={"format": "csv"})
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0] == "operation,num1,num2,result,timestamp"
+        assert lines[2].startswith("sqrt,2.0,,")
+
+    def test_columnar_export_layout(self):
+        """Test columnar export packs fixed-width columns per batch"""
+        response = client.get("/history/export", params={"format": "columnar", "chunk_size": 3})
+        data = response.content
+        assert data[:5] == COLUMNAR_MAGIC + bytes([COLUMNAR_VERSION])
+        # Two batches of 3 and 1 rows: 4-byte count + 2x uint8 + 4x 8-byte columns per row
+        assert len(data) == 5 + (4 + 3 * 34) + (4 + 1 * 34)
+        assert struct.unpack_from("<I", data, 5) == (3,)
+
+    def test_export_empty_history(self):
+        """Test exporting an empty history"""
+        client.delete("/history")
+        assert client.get("/history/export").content == b""
+
+    def test_export_invalid_format(self):
+        """Test unsupported export format returns 400"""
+        response = client.get("/history/export", params={"format": "xml"})
+        assert response.status_code == 400
+        assert "error" in response.json()
+
+    def test_import_is_idempotent(self):
+        """Test importing entries already in history does not duplicate them"""
+        original = client.get("/history").json()["history"]
+        exported = client.get("/history/export").content
+        response = client.post("/history/import", content=exported)
+        assert response.json() == {"received": 4, "imported": 0, "count": 4}
+        assert client.get("/history").json()["history"] == original
+
+    def test_import_merges_by_timestamp(self):
+        """Test imported entries are interleaved with existing ones by timestamp"""
+        history = client.get("/history").json()["history"]
+        record = (
+            '{"operation":"add","num1":100,"num2":1,"result":101,'
+            f'"timestamp":"{history[1]["timestamp"]}"}}'
+        )
+        response = client.post("/history/import", content=record)
+        assert response.json() == {"received": 1, "imported": 1, "count": 5}
+        merged = client.get("/history").json()["history"]
+        # Ties keep existing entries first
+        assert merged[2]["num1"] == 100
+        _assert_most_recent_first(merged)
+
+    def test_import_older_archive_keeps_live_entries_first(self):
+        """Test restoring an old archive does not jump ahead of newer entries"""
+        old = (
+            '{"operation":"add","num1":1,"num2":1,"result":2,'
+            '"timestamp":"2000-01-01T00:00:00"}'
+        )
+        response = client.post("/history/import", content=old)
+        assert response.json() == {"received": 1, "imported": 1, "count": 5}
+        history = client.get("/history").json()["history"]
+        assert history[-1]["timestamp"] == "2000-01-01T00:00:00"
+        _assert_most_recent_first(history)
+
+    def test_import_reports_entries_kept(self):
+        """Test entries older than a full history are not counted as imported"""
+        for i in range(25):
+            client.post("/calculate", json={"operation": "add", "num1": i, "num2": 1})
+        old = (
+            '{"operation":"add","num1":1,"num2":1,"result":2,'
+            '"timestamp":"2000-01-01T00:00:00"}'
+        )
+        response = client.post("/history/import", content=old)
+        assert response.json() == {"received": 1, "imported": 0, "count": 25}
+
+    def test_import_out_of_range_aware_timestamp(self):
+        """Test aware timestamps that overflow when converted to UTC return 400"""
+        record = (
+            '{"operation":"add","num1":1,"num2":1,"result":2,'
+            '"timestamp":"0001-01-01T00:00:00+01:00"}'
+        )
+        response = client.post("/history/import", content=record)
+        assert response.status_code == 400
+        assert "out of range" in response.json()["error"]
+
+    def test_import_oversized_csv_field(self):
+        """Test CSV fields beyond the parser limit return 400"""
+        content = "operation,num1,num2,result,timestamp\nadd,\"" + "1" * 200_000 + "\",1,2,x\n"
+        response = client.post("/history/import", params={"format": "csv"}, content=content)
+        assert response.status_code == 400
+        assert response.json()["error"].startswith("Invalid record on line")
+
+    def test_import_body_too_large(self):
+        """Test import bodies over the size limit are rejected before decoding"""
+        response = client.post("/history/import", content=b"\n" * (MAX_IMPORT_BYTES + 1))
+        assert response.status_code == 413
+        assert len(client.get("/history").json()["history"]) == 4
+
+    def test_import_timezone_aware_timestamp(self):
+        """Test timezone-aware timestamps are normalized to naive UTC"""
+        record = (
+            '{"operation":"add","num1":1,"num2":1,"result":2,'
+            '"timestamp":"2000-01-01T02:00:00+02:00"}'
+        )
+        response = client.post(
+            "/history/import",
+            params={"replace": "true"},
+            content=record
+        )
+        assert response.status_code == 200
+        history = client.get("/history").json()["history"]
+        assert history[0]["timestamp"] == "2000-01-01T00:00:00"
+
+    def test_import_replace(self):
+        """Test replace clears existing history first"""
+        exported = client.get("/history/export").content
+        response = client.post(
+            "/history/import",
+            params={"replace": "true"},
+            content=exported
+        )
+        assert response.json() == {"received": 4, "imported": 4, "count": 4}
+
+    def test_import_respects_history_limit(self):
+        """Test importing more than 25 entries keeps the most recent 25"""
+        lines = [
+            '{"operation":"add","num1":%d,"num2":1,"result":%d,'
+            '"timestamp":"2024-01-01T00:00:%02d"}' % (i, i + 1, i)
+            for i in range(30)
+        ]
+        response = client.post(
+            "/history/import",
+            params={"replace": "true"},
+            content="\n".join(lines)
+        )
+        assert response.json() == {"received": 30, "imported": 25, "count": 25}
+        history = client.get("/history").json()["history"]
+        assert history[0]["num1"] == 29
+        assert history[-1]["num1"] == 5
+
+    @pytest.mark.parametrize("format,content", [
+        ("ndjson", b'{"operation": "add"}'),
+        ("ndjson", b'{"operation":"cube","num1":1,"num2":null,"result":1,"timestamp":"2024-01-01T00:00:00"}'),
+        ("csv", b"operation,num1\nadd,1\n"),
+        ("csv", b"operation,num1,num2,result,timestamp\nadd,1,2,3,yesterday\n"),
+        ("ndjson", b'{"operation":"add","num1":NaN,"num2":1,"result":2,"timestamp":"2024-01-01T00:00:00"}'),
+        ("ndjson", b'{"operation":"add","num1":1,"num2":1,"result":Infinity,"timestamp":"2024-01-01T00:00:00"}'),
+        ("csv", b"operation,num1,num2,result,timestamp\nadd,1,2,inf,2024-01-01T00:00:00\n"),
+        ("columnar", b"not columnar"),
+        ("columnar", COLUMNAR_MAGIC + bytes([COLUMNAR_VERSION]) + struct.pack(
+            "<I2B3dq", 1, 0, 1, 1.0, 1.0, float("inf"), 0
+        )),
+        ("columnar", COLUMNAR_MAGIC + bytes([COLUMNAR_VERSION]) + struct.pack("<I", 2) + b"\x00"),
+    ])
+    def test_import_malformed(self, format, content):
+        """Test malformed imports are rejected without changing history"""
+        response = client.post("/history/import", params={"format": format}, content=content)
+        assert response.status_code == 400
+        assert "error" in response.json()
+        assert len(client.get("/history").json()["history"]) == 4
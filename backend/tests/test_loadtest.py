@@ -0,0 +1,142 @@
+import json
+import socket
+
+import httpx
+import pytest
+from app.main import app
+from benchmarks.loadtest import (
+    ClientResult,
+    TRANSPORT_ERROR_STATUS,
+    check_history,
+    main,
+    parse_mix,
+    percentile,
+    run_clients,
+    summarize,
+)
+
+
+def _entry(num1: float, timestamp: str, result: float = None) -> dict:
+    """Build a history entry for an addition of num1 and 1"""
+    return {
+        "operation": "add",
+        "num1": num1,
+        "num2": 1,
+        "result": num1 + 1 if result is None else result,
+        "timestamp": timestamp,
+    }
+
+
+class TestLoadTestHelpers:
+    """Test load generator parsing and statistics"""
+
+    def test_parse_mix(self):
+        """Test request mix parsing"""
+        assert parse_mix("calculate=8,history=1,clear=1") == {
+            "calculate": 8.0, "history": 1.0, "clear": 1.0
+        }
+
+    def test_parse_mix_unknown_kind(self):
+        """Test unknown request kinds are rejected"""
+        with pytest.raises(ValueError):
+            parse_mix("calculate=1,upload=1")
+
+    def test_parse_mix_all_zero(self):
+        """Test a mix with no positive weight is rejected"""
+        with pytest.raises(ValueError):
+            parse_mix("calculate=0")
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([], 50) == 0
+
+    def test_merge_uses_longest_elapsed(self):
+        """Test merged results span the slowest concurrent client process"""
+        merged = ClientResult()
+        merged.merge(ClientResult(elapsed=1.2))
+        merged.merge(ClientResult(elapsed=1.5))
+        assert merged.elapsed == 1.5
+
+    def test_check_history_consistent(self):
+        """Test a well-formed history has no problems"""
+        history = [_entry(2, "2024-01-01T00:00:02"), _entry(1, "2024-01-01T00:00:01")]
+        assert check_history(history) == []
+
+    def test_check_history_out_of_order(self):
+        """Test histories not most-recent-first are flagged"""
+        history = [_entry(1, "2024-01-01T00:00:01"), _entry(2, "2024-01-01T00:00:02")]
+        assert check_history(history) == ["history_out_of_order"]
+
+    def test_check_history_wrong_result(self):
+        """Test entries whose result does not match are flagged"""
+        assert check_history([_entry(1, "2024-01-01T00:00:01", result=5)]) == [
+            "history_wrong_result"
+        ]
+
+
+class TestLoadTestRun:
+    """Test a short load run against the in-process app"""
+
+    async def test_run_clients(self):
+        """Test clients exercise every request kind without errors"""
+        def factory():
+            return httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://test"
+            )
+
+        mix = {"calculate": 3, "history": 1, "clear": 1}
+        result = await run_clients(4, 0.3, mix, factory, seed=1)
+        report = summarize(result)
+
+        assert report["requests"] > 0
+        assert report["elapsed_s"] >= 0.3
+        assert set(report["kinds"]) == set(mix)
+        assert report["transport_errors"] == {}
+        assert report["inconsistencies"] == {}
+        assert all(stats["error_rate"] == 0 for stats in report["kinds"].values())
+
+    async def test_transport_errors_back_off(self):
+        """Test clients back off and record latency when the server is unreachable"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        def factory():
+            return httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}")
+
+        result = await run_clients(4, 0.3, {"history": 1}, factory, seed=1)
+        report = summarize(result)
+
+        failures = result.statuses["history"][TRANSPORT_ERROR_STATUS]
+        assert failures > 0
+        # Without backoff each client would retry thousands of times
+        assert failures < 4 * 20
+        assert len(result.latencies["history"]) == failures
+        assert report["kinds"]["history"]["error_rate"] == 1
+        assert report["transport_error_rate"] == 1
+
+
+@pytest.mark.slow
+class TestLoadTestServer:
+    """Smoke test the socket-level path against a real uvicorn server"""
+
+    def test_main_against_uvicorn(self, capsys):
+        """Test a short run starts the server, drives it and reports JSON"""
+        exit_code = main([
+            "--duration", "0.5",
+            "--processes", "2",
+            "--concurrency", "2",
+            "--seed", "1",
+            "--json",
+        ])
+        assert exit_code == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["requests"] > 0
+        assert report["transport_errors"] == {}
+        assert report["inconsistencies"] == {}
+        assert all(stats["error_rate"] == 0 for stats in report["kinds"].values())
@@ -0,0 +1,173 @@
+import re
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.profiling import SamplingProfiler, ServerTiming
+
+client = TestClient(app)
+
+
+def _stage_names(header: str) -> list[str]:
+    """Extract metric names from a Server-Timing header"""
+    return [metric.split(";")[0].strip() for metric in header.split(",")]
+
+
+class TestServerTiming:
+    """Test the per-stage Server-Timing header"""
+
+    def test_header_absent_by_default(self, monkeypatch):
+        """Test no Server-Timing header without config or debug header"""
+        monkeypatch.delenv("SERVER_TIMING", raising=False)
+        response = client.post(
+            "/calculate",
+            json={"operation": "add", "num1": 1, "num2": 2}
+        )
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+
+    def test_debug_header_enables_timing(self):
+        """Test the debug header produces calculate stages"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "add", "num1": 1, "num2": 2},
+            headers={"X-Debug-Timing": "1"}
+        )
+        assert response.status_code == 200
+        header = response.headers["server-timing"]
+        assert _stage_names(header) == [
+            "validate", "calculate", "history", "serialize", "total"
+        ]
+        assert re.search(r"calculate;dur=\d+\.\d{3}", header)
+
+    @pytest.mark.parametrize("value", ["true", "YES"])
+    def test_debug_header_accepts_truthy_values(self, value):
+        """Test the debug header accepts the same values as SERVER_TIMING"""
+        response = client.get("/health", headers={"X-Debug-Timing": value})
+        assert "total;dur=" in response.headers["server-timing"]
+
+    def test_debug_header_false(self, monkeypatch):
+        """Test a falsy debug header leaves timing off"""
+        monkeypatch.delenv("SERVER_TIMING", raising=False)
+        response = client.get("/health", headers={"X-Debug-Timing": "0"})
+        assert "server-timing" not in response.headers
+
+    def test_config_enables_timing(self, monkeypatch):
+        """Test SERVER_TIMING=1 enables timing for every request"""
+        monkeypatch.setenv("SERVER_TIMING", "1")
+        response = client.get("/health")
+        assert "total;dur=" in response.headers["server-timing"]
+
+    def test_validation_error_stages(self):
+        """Test validation failures report the handler stage"""
+        response = client.post(
+            "/calculate",
+            json={"operation": "add", "num1": 5},
+            headers={"X-Debug-Timing": "1"}
+        )
+        assert response.status_code == 422
+        assert _stage_names(response.headers["server-timing"]) == [
+            "validate", "validation_handler", "serialize", "total"
+        ]
+
+    def test_server_timing_format(self):
+        """Test header value formatting"""
+        timing = ServerTiming()
+        timing.mark("stage")
+        assert re.fullmatch(
+            r"stage;dur=\d+\.\d{3}, total;dur=\d+\.\d{3}",
+            timing.header_value()
+        )
+
+
+class TestSamplingProfiler:
+    """Test the sampling profiler and its admin endpoint"""
+
+    def test_collapsed_stacks(self):
+        """Test samples of another thread appear as collapsed stacks"""
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_worker, name="busy")
+        worker.start()
+        try:
+            output = SamplingProfiler(interval=0.001).profile(0.05)
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = output.splitlines()
+        assert lines
+        assert all(re.fullmatch(r".+ \d+", line) for line in lines)
+        assert any(line.startswith("busy;") and "busy_worker" in line for line in lines)
+
+    def test_idle_threads_skipped(self):
+        """Test threads waiting on an event are only recorded with include_idle"""
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait, name="parked")
+        waiter.start()
+        try:
+            sampler = SamplingProfiler(interval=0.001)
+            default = sampler.profile(0.02)
+            with_idle = sampler.profile(0.02, include_idle=True)
+        finally:
+            stop.set()
+            waiter.join()
+
+        assert not any(line.startswith("parked;") for line in default.splitlines())
+        assert any(line.startswith("parked;") for line in with_idle.splitlines())
+
+    def test_concurrent_profile_rejected(self):
+        """Test only one profile may run at a time"""
+        sampler = SamplingProfiler()
+        thread = threading.Thread(target=sampler.profile, args=(0.2,))
+        thread.start()
+        try:
+            while not sampler.running:
+                pass
+            with pytest.raises(RuntimeError):
+                sampler.profile(0.01)
+        finally:
+            thread.join()
+
+    def test_endpoint_disabled_without_token(self, monkeypatch):
+        """Test the admin endpoint is hidden unless ADMIN_TOKEN is set"""
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+        response = client.get("/admin/profile", params={"seconds": 0.01})
+        assert response.status_code == 404
+
+    def test_endpoint_requires_token(self, monkeypatch):
+        """Test a wrong admin token is rejected"""
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        response = client.get(
+            "/admin/profile",
+            params={"seconds": 0.01},
+            headers={"X-Admin-Token": "wrong"}
+        )
+        assert response.status_code == 403
+
+    def test_endpoint_rejects_long_profiles(self, monkeypatch):
+        """Test profile duration is bounded"""
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        response = client.get(
+            "/admin/profile",
+            params={"seconds": 600},
+            headers={"X-Admin-Token": "secret"}
+        )
+        assert response.status_code == 400
+
+    def test_endpoint_returns_stacks(self, monkeypatch):
+        """Test the admin endpoint returns a collapsed-stack dump"""
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        response = client.get(
+            "/admin/profile",
+            params={"seconds": 0.05, "idle": "true"},
+            headers={"X-Admin-Token": "secret"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert re.search(r"^\S.* \d+$", response.text, re.MULTILINE)
@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Budgets in milliseconds; override on slow CI machines
+APP_IMPORT_BUDGET_MS = float(os.environ.get("APP_IMPORT_BUDGET_MS", 100))
+TOTAL_IMPORT_BUDGET_MS = float(os.environ.get("TOTAL_IMPORT_BUDGET_MS", 2000))
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", 3000))
+
+# Times a cold worker from before import to its first /health response
+_STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    assert client.get("/health").status_code == 200
+    print((time.perf_counter() - start) * 1000)
+"""
+
+# Modules that must only be loaded when the feature using them is first hit
+LAZY_MODULES = {"app.static", "app.history_io", "gzip", "brotli"}
+
+
+def _import_times(code: str = "import app.main") -> dict[str, tuple[int, int]]:
+    """
+    Run code in a fresh interpreter under -X importtime
+
+    Returns:
+        Mapping of module name to (self, cumulative) import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+class TestStartup:
+    """Keep worker cold-start cost within budget"""
+
+    def test_app_import_within_budget(self):
+        """Test the app's own modules import quickly"""
+        times = _import_times()
+        app_us = sum(
+            self_us for name, (self_us, _) in times.items()
+            if name == "app" or name.startswith("app.")
+        )
+        assert app_us / 1000 < APP_IMPORT_BUDGET_MS
+
+    def test_total_import_within_budget(self):
+        """Test importing the app including its dependencies stays within budget"""
+        times = _import_times()
+        _, cumulative_us = times["app.main"]
+        assert cumulative_us / 1000 < TOTAL_IMPORT_BUDGET_MS
+
+    def test_rarely_used_modules_not_imported(self):
+        """Test optional subsystems are not loaded at startup"""
+        times = _import_times()
+        assert LAZY_MODULES.isdisjoint(times)
+
+    def test_first_health_within_budget(self):
+        """Test a fresh process serves /health through the lifespan within budget"""
+        result = subprocess.run(
+            [sys.executable, "-c", _STARTUP_SCRIPT],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert float(result.stdout.strip()) < STARTUP_BUDGET_MS
+
+    def test_history_manager_created_lazily(self):
+        """Test importing the app does not create the history manager"""
+        subprocess.run(
+            [
+                sys.executable, "-c",
+                "import app.main, app.history; "
+                "assert app.history._history_manager is None"
+            ],
+            cwd=BACKEND_DIR,
+            check=True,
+        )
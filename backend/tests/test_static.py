@@ -0,0 +1,156 @@
+import re
+import threading
+import time
+
+from fastapi.testclient import TestClient
+from app import main, static
+from app.main import app
+from app.static import choose_encoding, parse_accept_encoding
+
+client = TestClient(app)
+
+
+def _asset_paths(html: str) -> list[str]:
+    """Extract fingerprinted asset paths referenced by the index page"""
+    return re.findall(r'"(/assets/[^"]+)"', html)
+
+
+class TestContentNegotiation:
+    """Test Accept-Encoding parsing and encoding selection"""
+
+    def test_parse_quality_values(self):
+        """Test q-values are parsed per encoding"""
+        parsed = parse_accept_encoding("gzip;q=0.5, br, identity;q=0")
+        assert parsed == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+
+    def test_prefers_brotli_when_available(self):
+        """Test brotli wins over gzip at equal quality"""
+        assert choose_encoding("gzip, br", ["br", "gzip"]) == "br"
+
+    def test_respects_quality(self):
+        """Test a higher q-value wins over preference order"""
+        assert choose_encoding("br;q=0.1, gzip", ["br", "gzip"]) == "gzip"
+
+    def test_rejected_encoding_falls_back_to_identity(self):
+        """Test q=0 disables an encoding"""
+        assert choose_encoding("gzip;q=0", ["gzip"]) == "identity"
+
+    def test_missing_header_is_identity(self):
+        """Test no Accept-Encoding means uncompressed"""
+        assert choose_encoding(None, ["br", "gzip"]) == "identity"
+
+
+class TestStaticFrontend:
+    """Test the frontend served by the backend"""
+
+    def test_index_served(self):
+        """Test index page is served with revalidation headers"""
+        response = client.get("/", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert response.headers["cache-control"] == "no-cache"
+        assert "etag" in response.headers
+        assert '<meta name="api-url" content="">' in response.text
+
+    def test_index_references_fingerprinted_assets(self):
+        """Test index page links to content-hashed asset names"""
+        html = client.get("/").text
+        paths = _asset_paths(html)
+        assert any(re.fullmatch(r"/assets/style\.[0-9a-f]{12}\.css", p) for p in paths)
+        assert any(re.fullmatch(r"/assets/app\.[0-9a-f]{12}\.js", p) for p in paths)
+
+    def test_index_not_modified(self):
+        """Test matching If-None-Match returns 304 without a body"""
+        first = client.get("/", headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["etag"]
+        response = client.get(
+            "/",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_index_etag_differs_per_encoding(self):
+        """Test compressed and uncompressed variants have distinct ETags"""
+        plain = client.get("/", headers={"Accept-Encoding": "identity"})
+        gzipped = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert plain.headers["etag"] != gzipped.headers["etag"]
+
+    def test_asset_gzip_variant(self):
+        """Test assets are served gzip-encoded when requested"""
+        path = next(p for p in _asset_paths(client.get("/").text) if p.endswith(".js"))
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert "API_URL" in response.text
+
+    def test_asset_immutable_cache(self):
+        """Test fingerprinted assets are cached long-term"""
+        path = next(p for p in _asset_paths(client.get("/").text) if p.endswith(".css"))
+        response = client.get(path, headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+        assert "content-encoding" not in response.headers
+
+    def test_index_head(self):
+        """Test HEAD returns the index headers without a body"""
+        response = client.head("/", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "etag" in response.headers
+        assert response.content == b""
+
+    def test_asset_head(self):
+        """Test HEAD on an asset returns its cache headers"""
+        path = next(p for p in _asset_paths(client.get("/").text) if p.endswith(".js"))
+        response = client.head(path)
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+
+    def test_assets_built_at_startup(self, monkeypatch):
+        """Test the lifespan hook builds the assets without a frontend request"""
+        monkeypatch.setattr(main, "_static_assets_built", False)
+        monkeypatch.setattr(main, "_static_assets", None)
+        with TestClient(app):
+            pass
+        assert main._static_assets_built
+        assert main._static_assets is not None
+
+    def test_concurrent_requests_build_once(self, monkeypatch):
+        """Test concurrent first requests share a single asset build"""
+        builds = []
+        original = static.StaticAssets
+
+        def counting_build(directory):
+            builds.append(directory)
+            time.sleep(0.05)
+            return original(directory)
+
+        monkeypatch.setattr(main, "_static_assets_built", False)
+        monkeypatch.setattr(main, "_static_assets", None)
+        monkeypatch.setattr(static, "StaticAssets", counting_build)
+        threads = [threading.Thread(target=main.get_static_assets) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(builds) == 1
+
+    def test_warmup_failure_is_logged(self, monkeypatch, caplog):
+        """Test a failed warmup is logged at startup instead of at shutdown"""
+        def failing_build(directory):
+            raise OSError("disk error")
+
+        monkeypatch.setattr(main, "_static_assets_built", False)
+        monkeypatch.setattr(main, "_static_assets", None)
+        monkeypatch.setattr(static, "StaticAssets", failing_build)
+        with TestClient(app) as startup_client:
+            assert startup_client.get("/health").status_code == 200
+        assert "Failed to build frontend assets" in caplog.text
+
+    def test_unknown_asset_not_found(self):
+        """Test unknown asset names return 404"""
+        response = client.get("/assets/app.000000000000.js")
+        assert response.status_code == 404
@@ -1,5 +1,7 @@
 // API Configuration
-const API_URL = 'http://localhost:8000';
+// An empty api-url meta tag (injected when served by the backend) means same origin
+const apiUrlMeta = document.querySelector('meta[name="api-url"]');
+const API_URL = apiUrlMeta ? apiUrlMeta.content : 'http://localhost:8000';
 
 // State
 let displayExpression = ''; // The full expression shown to user (e.g., "1+2*3")